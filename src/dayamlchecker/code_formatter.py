@@ -15,14 +15,22 @@ Usage:
 
 from __future__ import annotations
 
+import hashlib
+import importlib.metadata
 import re
 import sys
 import os
-from dataclasses import dataclass, field
+import tempfile
+import threading
+import time
+from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any
 
 import black
+import ruamel.yaml
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap, CommentedSeq
 
@@ -33,17 +41,57 @@ __all__ = [
     "FormatterConfig",
 ]
 
+# Round-trip loaders reused across format_yaml_string calls. A YAML instance
+# keeps parser state while loading, so each thread gets its own.
+_yaml_local = threading.local()
 
-@dataclass
+
+def _round_trip_yaml() -> YAML:
+    """Return this thread's round-trip loader, creating it on first use."""
+    yaml = getattr(_yaml_local, "yaml", None)
+    if yaml is None:
+        yaml = YAML(typ="rt")
+        yaml.preserve_quotes = True
+        yaml.width = 4096  # Prevent line wrapping in strings
+        _yaml_local.yaml = yaml
+    return yaml
+
+
+# Bump when formatter output changes so stale on-disk cache entries are ignored
+_CACHE_VERSION = 2
+# Cache entries not read or written for this long are pruned
+_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+# Pruning scans the whole cache, so runs do it at most this often
+_CACHE_PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+# Its mtime records the last prune; the name never matches _CACHE_ENTRY_RE
+_CACHE_PRUNE_STAMP = ".last-prune"
+# Names _cache_entry produces: a 2-hex shard holding 40-hex entries. Pruning
+# touches nothing else, since --cache-dir may point at a directory with
+# unrelated files in it.
+_CACHE_SHARD_RE = re.compile(r"[0-9a-f]{2}")
+_CACHE_ENTRY_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def _default_cache_dir() -> Path:
+    """Return the per-user cache directory for formatted outputs."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "dayamlchecker"
+
+
+@dataclass(frozen=True)
 class FormatterConfig:
-    """Configuration for the code formatter."""
+    """Configuration for the code formatter.
+
+    Instances are immutable and hashable; set-valued options are frozen on
+    construction so plain ``set`` literals are still accepted.
+    """
 
     # Keys that contain Python code to format
-    python_keys: set[str] = field(default_factory=lambda: {"code", "validation code"})
+    python_keys: AbstractSet[str] = frozenset({"code", "validation code"})
 
     # Black configuration
     black_line_length: int = 88
-    black_target_versions: set[black.TargetVersion] = field(default_factory=set)
+    black_target_versions: AbstractSet[black.TargetVersion] = frozenset()
 
     # Indentation conversion
     convert_indent_4_to_2: bool = True
@@ -54,6 +102,28 @@ class FormatterConfig:
     # Whether to preserve trailing whitespace in formatted blocks
     strip_trailing_whitespace: bool = True
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "python_keys", frozenset(self.python_keys))
+        object.__setattr__(
+            self, "black_target_versions", frozenset(self.black_target_versions)
+        )
+
+    @cached_property
+    def fingerprint(self) -> bytes:
+        """Stable digest of every setting that affects formatter output."""
+        settings = (
+            sorted(self.python_keys),
+            self.black_line_length,
+            sorted(v.name for v in self.black_target_versions),
+            self.convert_indent_4_to_2,
+            self.prefer_literal_blocks,
+            self.strip_trailing_whitespace,
+        )
+        return hashlib.blake2b(repr(settings).encode("utf-8"), digest_size=16).digest()
+
+
+_TRAILING_WS_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+
 
 def _normalize_newlines(text: str) -> str:
     """Normalize all newline variants to Unix-style LF."""
@@ -67,23 +137,16 @@ def _strip_common_indent(lines: list[str]) -> tuple[list[str], int]:
     Returns:
         Tuple of (dedented lines, number of spaces removed)
     """
-    indents = []
-    for line in lines:
-        if line.strip():  # Skip empty/whitespace-only lines
-            match = re.match(r"^( *)", line)
-            if match:
-                indents.append(len(match.group(1)))
-
-    if not indents:
+    min_indent = min(
+        (len(line) - len(line.lstrip(" ")) for line in lines if line.strip()),
+        default=0,
+    )
+    if not min_indent:
         return lines, 0
 
-    min_indent = min(indents)
-    dedented = []
-    for line in lines:
-        if len(line) >= min_indent:
-            dedented.append(line[min_indent:])
-        else:
-            dedented.append(line.lstrip() if line.strip() else "")
+    # Whitespace-only lines are passed through untouched so blank lines
+    # (and their newlines) survive regardless of their length.
+    dedented = [line[min_indent:] if line.strip() else line for line in lines]
     return dedented, min_indent
 
 
@@ -125,6 +188,26 @@ def _reindent(text: str, indent: int) -> str:
     return "".join(result)
 
 
+@lru_cache(maxsize=4096)
+def _black_format_cached(
+    code: str,
+    line_length: int,
+    target_versions: frozenset[black.TargetVersion],
+) -> str:
+    """
+    Run Black on already-dedented code, memoized on code and Black settings.
+
+    Black is pure for a given (code, mode), and small snippets repeat often
+    across blocks and files, so identical inputs only get formatted once.
+    """
+    mode = black.Mode(line_length=line_length, target_versions=set(target_versions))
+    try:
+        return black.format_file_contents(code, fast=False, mode=mode)
+    except black.NothingChanged:
+        # Code is already formatted
+        return code
+
+
 def format_python_code(
     code: str,
     config: FormatterConfig | None = None,
@@ -160,15 +243,11 @@ def format_python_code(
         dedented_text += "\n"
 
     # Format with Black
-    mode = black.Mode(
-        line_length=config.black_line_length,
-        target_versions=config.black_target_versions,
+    formatted = _black_format_cached(
+        dedented_text,
+        config.black_line_length,
+        frozenset(config.black_target_versions),
     )
-    try:
-        formatted = black.format_file_contents(dedented_text, fast=False, mode=mode)
-    except black.NothingChanged:
-        # Code is already formatted
-        formatted = dedented_text
 
     # Convert 4-space to 2-space indentation
     if config.convert_indent_4_to_2:
@@ -176,7 +255,7 @@ def format_python_code(
 
     # Strip trailing whitespace from each line if configured
     if config.strip_trailing_whitespace:
-        formatted = "\n".join(line.rstrip() for line in formatted.splitlines())
+        formatted = _TRAILING_WS_RE.sub("", formatted)
         if formatted and not formatted.endswith("\n"):
             formatted += "\n"
 
@@ -329,13 +408,10 @@ def format_yaml_string(
     if config is None:
         config = FormatterConfig()
 
-    yaml = YAML()
-    yaml.preserve_quotes = True
-    yaml.width = 4096  # Prevent line wrapping in strings
     # Use ruamel's parser to obtain position metadata; we'll replace text
 
     # Load as a stream to handle multi-document YAML
-    documents = list(yaml.load_all(yaml_content))
+    documents = list(_round_trip_yaml().load_all(yaml_content))
 
     lines = yaml_content.splitlines(keepends=True)
     all_replacements: list[tuple[int, int, str, tuple[str, ...]]] = []
@@ -366,6 +442,7 @@ def format_yaml_file(
     file_path: str | Path,
     config: FormatterConfig | None = None,
     write: bool = True,
+    cache_dir: str | Path | None = None,
 ) -> tuple[str, bool]:
     """
     Format Python code blocks in a YAML file.
@@ -374,21 +451,185 @@ def format_yaml_file(
         file_path: Path to the YAML file
         config: Formatter configuration (uses defaults if None)
         write: Whether to write changes back to the file
+        cache_dir: Directory for the on-disk result cache (disabled if None)
 
     Returns:
         Tuple of (formatted content, whether any changes were made)
     """
     path = Path(file_path)
-    content = path.read_text(encoding="utf-8")
+    # Raw bytes skip the TextIOWrapper layer; normalize newlines ourselves to
+    # match what text-mode reading would have produced.
+    content = _normalize_newlines(path.read_bytes().decode("utf-8"))
 
-    formatted, changed = format_yaml_string(content, config)
+    if config is None:
+        config = FormatterConfig()
+
+    cached = None
+    if cache_dir is not None:
+        key = _cache_key(content, config)
+        cached = _cache_read(Path(cache_dir), key, content)
+
+    if cached is not None:
+        formatted, changed = cached
+    else:
+        formatted, changed = format_yaml_string(content, config)
+        if cache_dir is not None:
+            _cache_write(Path(cache_dir), key, formatted, changed)
 
     if changed and write:
-        path.write_text(formatted, encoding="utf-8")
+        path.write_bytes(formatted.encode("utf-8"))
 
     return formatted, changed
 
 
+@lru_cache(maxsize=None)
+def _formatter_stamp() -> str:
+    """Everything besides config and content that can change formatter output."""
+    try:
+        package_version = importlib.metadata.version("dayamlchecker")
+    except importlib.metadata.PackageNotFoundError:  # running from a source tree
+        package_version = "unknown"
+    # Source checkouts and editable installs keep their version across local
+    # edits, so the formatter's own code is part of the key too
+    try:
+        source = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16)
+        source_digest = source.hexdigest()
+    except OSError:
+        source_digest = "unknown"
+    return ":".join(
+        (
+            str(_CACHE_VERSION),
+            package_version,
+            source_digest,
+            black.__version__,
+            ruamel.yaml.__version__,
+        )
+    )
+
+
+def _cache_key(content: str, config: FormatterConfig) -> str:
+    """Content-addressed key for a file's formatting result under config."""
+    digest = hashlib.blake2b(config.fingerprint, digest_size=20)
+    digest.update(_formatter_stamp().encode("utf-8"))
+    digest.update(content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_entry(cache_dir: Path, key: str) -> Path:
+    # Shard on the first byte of the key to keep directories small
+    return cache_dir / key[:2] / key
+
+
+def _cache_read(cache_dir: Path, key: str, content: str) -> tuple[str, bool] | None:
+    """
+    Look up a cached formatting result.
+
+    Entries hold a one-character changed flag and a newline, followed by the
+    formatted text when it differs from the input.
+
+    Returns:
+        Tuple of (formatted content, whether any changes were made), or None
+        on a miss or unreadable entry
+    """
+    entry = _cache_entry(cache_dir, key)
+    try:
+        data = entry.read_bytes().decode("utf-8")
+        # Refresh mtime so entries still in use survive pruning
+        os.utime(entry)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    flag, _, formatted = data.partition("\n")
+    if flag == "0":
+        return content, False
+    if flag == "1":
+        return formatted, True
+    return None
+
+
+def _cache_write(cache_dir: Path, key: str, formatted: str, changed: bool) -> None:
+    """Atomically store a formatting result; cache failures are never fatal."""
+    entry = _cache_entry(cache_dir, key)
+    data = ("1\n" + formatted) if changed else "0\n"
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=entry.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data.encode("utf-8"))
+            os.replace(tmp_name, entry)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_dir: Path, max_age: float = _CACHE_MAX_AGE_SECONDS) -> None:
+    """Delete cache entries whose mtime is older than max_age seconds.
+
+    Only files laid out like _cache_entry's (``<2 hex>/<40 hex>``, with the
+    entry name starting with its shard) are candidates; anything else under
+    cache_dir is left alone.
+    """
+    cutoff = time.time() - max_age
+    try:
+        shards = list(os.scandir(cache_dir))
+    except OSError:
+        return
+    for shard in shards:
+        if not (
+            _CACHE_SHARD_RE.fullmatch(shard.name)
+            and shard.is_dir(follow_symlinks=False)
+        ):
+            continue
+        try:
+            with os.scandir(shard.path) as entries:
+                for entry in entries:
+                    if not (
+                        _CACHE_ENTRY_RE.fullmatch(entry.name)
+                        and entry.name.startswith(shard.name)
+                        and entry.is_file(follow_symlinks=False)
+                    ):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+        except OSError:
+            continue
+
+
+def _prune_cache_if_due(
+    cache_dir: Path, interval: float = _CACHE_PRUNE_INTERVAL_SECONDS
+) -> None:
+    """Run _prune_cache unless it already ran within the last interval seconds.
+
+    Keeps the per-run cost independent of the cache size: most runs only stat
+    the stamp file.
+    """
+    stamp = cache_dir / _CACHE_PRUNE_STAMP
+    try:
+        if time.time() - stamp.stat().st_mtime < interval:
+            return
+    except FileNotFoundError:
+        if not cache_dir.is_dir():
+            return  # nothing cached yet, and no reason to create the directory
+    except OSError:
+        return
+    _prune_cache(cache_dir)
+    try:
+        stamp.touch()
+    except OSError:
+        pass
+
+
+# .git* also covers .github*; matched against bare directory names
+_DEFAULT_IGNORED_DIR_PREFIXES = (".git", ".venv")
+
+
+def _is_default_ignored_dir(dirname: str) -> bool:
+    return dirname.startswith(_DEFAULT_IGNORED_DIR_PREFIXES) or dirname == "sources"
+
+
 def _collect_yaml_files(
     paths: list[Path],
     check_all: bool = False,
@@ -399,51 +640,60 @@ def _collect_yaml_files(
 
     - Files are included if they have .yml or .yaml extension
     - Directories are recursively searched for YAML files
+    - The result is de-duplicated and sorted so CLI output order is stable
     """
 
-    def _is_default_ignored_dir(dirname: str) -> bool:
-        return (
-            dirname.startswith(".git")
-            or dirname.startswith(".github")
-            or dirname.startswith(".venv")
-            or dirname == "sources"
-        )
-
     if include_default_ignores is None:
         include_default_ignores = not check_all
 
     yaml_files: list[Path] = []
     for path in paths:
         if path.is_dir():
-            # Recursively find all YAML files, pruning ignored directories
-            for root, dirnames, filenames in os.walk(path, topdown=True):
-                if include_default_ignores and _is_default_ignored_dir(Path(root).name):
-                    dirnames[:] = []
+            if include_default_ignores and _is_default_ignored_dir(path.name):
+                continue
+            # Recursively find all YAML files, pruning ignored directories.
+            # DirEntry carries the file type from the directory listing, so
+            # this avoids a stat() and a Path object for every entry.
+            pending = [os.fspath(path)]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as it:
+                        entries = list(it)
+                except OSError:
                     continue
-                if include_default_ignores:
-                    dirnames[:] = [
-                        dirname
-                        for dirname in dirnames
-                        if not _is_default_ignored_dir(dirname)
-                    ]
-                root_path = Path(root)
-                for filename in filenames:
-                    if filename.lower().endswith((".yml", ".yaml")):
-                        yaml_files.append(root_path / filename)
+                for entry in entries:
+                    if entry.is_dir():
+                        # Don't follow directory symlinks, as os.walk didn't
+                        if not entry.is_symlink() and not (
+                            include_default_ignores
+                            and _is_default_ignored_dir(entry.name)
+                        ):
+                            pending.append(entry.path)
+                    elif entry.name.lower().endswith((".yml", ".yaml")):
+                        yaml_files.append(Path(entry.path))
         elif path.suffix.lower() in (".yml", ".yaml"):
             yaml_files.append(path)
-    seen = set()
+    # Compare resolved paths as plain strings; Path.resolve() is realpath()
+    # plus a Path object we would throw away.
+    seen: set[str] = set()
     result = []
     for f in yaml_files:
-        resolved = f.resolve()
+        resolved = os.path.realpath(f)
         if resolved not in seen:
             seen.add(resolved)
             result.append(f)
     return sorted(result)
 
 
-def main() -> int:
-    """CLI entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``)
+
+    Returns:
+        Process exit code
+    """
     import argparse
 
     parser = argparse.ArgumentParser(
@@ -495,8 +745,29 @@ Examples:
             "(.git*, .github*, sources)"
         ),
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory for cached formatting results "
+            "(default: $XDG_CACHE_HOME/dayamlchecker or ~/.cache/dayamlchecker). "
+            "The cache is on by default; entries unused for 30 days are pruned "
+            "at most once a day"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the formatting result cache",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    cache_dir: Path | None = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or _default_cache_dir()
+        _prune_cache_if_due(cache_dir)
 
     config = FormatterConfig(
         black_line_length=args.line_length,
@@ -515,35 +786,36 @@ Examples:
     files_error = 0
 
     for file_path in yaml_files:
-        if not file_path.exists():
-            print(f"Error: File not found: {file_path}", file=sys.stderr)
-            files_error += 1
-            exit_code = 1
-            continue
-
+        # Let the read report missing files rather than stat-ing each one first
         try:
             _, changed = format_yaml_file(
                 file_path,
                 config=config,
                 write=not args.check,
+                cache_dir=cache_dir,
             )
-
-            if changed:
-                files_changed += 1
-                if args.check:
-                    print(f"Would reformat: {file_path}")
-                    exit_code = 1
-                elif not args.quiet:
-                    print(f"Reformatted: {file_path}")
-            else:
-                files_unchanged += 1
-                if not args.quiet:
-                    print(f"Unchanged: {file_path}")
-
+        except FileNotFoundError:
+            print(f"Error: File not found: {file_path}", file=sys.stderr)
+            files_error += 1
+            exit_code = 1
+            continue
         except Exception as e:
             print(f"Error processing {file_path}: {e}", file=sys.stderr)
             files_error += 1
             exit_code = 1
+            continue
+
+        if changed:
+            files_changed += 1
+            if args.check:
+                print(f"Would reformat: {file_path}")
+                exit_code = 1
+            elif not args.quiet:
+                print(f"Reformatted: {file_path}")
+        else:
+            files_unchanged += 1
+            if not args.quiet:
+                print(f"Unchanged: {file_path}")
 
     if not args.quiet:
         total = files_changed + files_unchanged + files_error
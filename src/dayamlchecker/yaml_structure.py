@@ -1,19 +1,26 @@
 # Each doc, apply this to each block
 import ast
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from functools import lru_cache
+import io
+import os
 from pathlib import Path
 import re
 import sys
 
 from typing import Any, Optional
 import yaml
+from yaml.constructor import SafeConstructor
 from yaml.loader import SafeLoader
-from mako.template import Template as MakoTemplate  # type: ignore[import-untyped]
-from mako.exceptions import (  # type: ignore[import-untyped]
-    SyntaxException,
-    CompileException,
-)
-import esprima  # type: ignore[import-untyped]
+
+try:
+    # libyaml's scanner/parser is roughly an order of magnitude faster
+    from yaml import CSafeLoader as _BaseLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _BaseLoader  # type: ignore[assignment]
 
 # TODO(brycew):
 # * DA is fine with mixed case it looks like (i.e. Subquestion, vs subquestion)
@@ -27,32 +34,119 @@ import esprima  # type: ignore[import-untyped]
 #   https://docassemble.org/docs/interviews.html#jinja2
 
 
-__all__ = ["find_errors_from_string", "find_errors", "_collect_yaml_files"]
+__all__ = [
+    "find_errors_from_string",
+    "find_errors_from_obj",
+    "find_errors",
+    "_collect_yaml_files",
+]
 
 # Global identifiers for _extract_conditional_fields_from_doc below. Should cover all show/hide style modifiers
 _IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*")
 _SIMPLE_IDENTIFIER_RE = re.compile(r"^[A-Za-z_]\w*$")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SIMPLE_COMPARISON_RE = re.compile(r"^\s*(.+?)\s*(==|!=)\s*(.+?)\s*$")
+# ${ ... } Mako expressions, swapped for a JS literal before parsing js show if
+_MAKO_EXPR_RE = re.compile(r"\$\{[^}]*\}", re.DOTALL)
 _JS_VAL_RE = re.compile(
     r"""val\s*\(\s*["']([^"']+)["']\s*\)"""
 )  # matches val("fieldName") or val('fieldName') and captures fieldName
-_SHOW_STYLE_MODIFIERS = {
-    "show if",
-    "enable if",
-    "js show if",
-    "js enable if",
-}
-_HIDE_STYLE_MODIFIERS = {
-    "hide if",
-    "disable if",
-    "js hide if",
-    "js disable if",
-}
+_SHOW_STYLE_MODIFIERS = frozenset(
+    {
+        "show if",
+        "enable if",
+        "js show if",
+        "js enable if",
+    }
+)
+_HIDE_STYLE_MODIFIERS = frozenset(
+    {
+        "hide if",
+        "disable if",
+        "js hide if",
+        "js disable if",
+    }
+)
 _CONDITIONAL_MODIFIERS = _SHOW_STYLE_MODIFIERS | _HIDE_STYLE_MODIFIERS
 
 # Ensure that if there's a space in the str, it's between quotes.
 space_in_str = re.compile("^[^ ]*['\"].* .*['\"][^ ]*$")
 
 
+@lru_cache(maxsize=1024)
+def _parse_python(
+    source: str,
+) -> tuple[Optional[ast.Module], Optional[SyntaxError]]:
+    """Parse Python source once per distinct text.
+
+    Returns ``(tree, None)`` on success or ``(None, error)`` on a syntax
+    error. The trees are shared between callers, so they must only be read.
+    """
+    try:
+        return ast.parse(source), None
+    except SyntaxError as ex:
+        return None, ex
+
+
+@lru_cache(maxsize=1024)
+def _mako_errors(text: str) -> tuple[tuple[str, int], ...]:
+    """Compile text as a Mako template once per distinct text.
+
+    Only the (message, line) pairs are kept. The exception itself is not, as
+    its traceback would pin mako's lexer/compiler frames in the cache.
+    """
+    # Imported here so that startup (--help, empty runs) doesn't pay for mako
+    from mako.template import Template as MakoTemplate  # type: ignore[import-untyped]
+    from mako.exceptions import (  # type: ignore[import-untyped]
+        SyntaxException,
+        CompileException,
+    )
+
+    try:
+        MakoTemplate(text, strict_undefined=True, input_encoding="utf-8")
+    except (SyntaxException, CompileException) as ex:
+        return ((str(ex), ex.lineno),)
+    return ()
+
+
+@lru_cache(maxsize=1024)
+def _variable_candidates(var_expr: str) -> frozenset[str]:
+    """Names that var_expr may match on a screen: itself and its parent paths."""
+    expr = var_expr.strip()
+    candidates = {expr}
+    if "." in expr:
+        parts = expr.split(".")
+        for i in range(len(parts), 0, -1):
+            candidates.add(".".join(parts[:i]))
+    expanded = set()
+    for candidate in candidates:
+        candidate = candidate.strip()
+        if not candidate:
+            continue
+        expanded.add(candidate)
+        # Accept both full indexed paths and their base paths, e.g.:
+        # children[i].parents["Other"] -> children[i].parents
+        while candidate.endswith("]") and "[" in candidate:
+            candidate = candidate[: candidate.rfind("[")].strip()
+            if candidate:
+                expanded.add(candidate)
+    return frozenset(expanded)
+
+
+@lru_cache(maxsize=1024)
+def _dotted_tails(name: str) -> frozenset[str]:
+    """Every part of name that follows a ".", e.g. a.b.c -> {"b.c", "c"}.
+
+    ``name.endswith("." + tail)`` holds exactly when tail is in this set.
+    """
+    tails = set()
+    idx = name.find(".")
+    while idx != -1:
+        tails.add(name[idx + 1 :])
+        idx = name.find(".", idx + 1)
+    return frozenset(tails)
+
+
 class YAMLStr:
     """Should be a direct YAML string, not a list or dict"""
 
@@ -66,15 +160,7 @@ class MakoText:
     """A string that will be run through a Mako template from DA. Needs to have valid Mako template"""
 
     def __init__(self, x):
-        self.errors = []
-        try:
-            self.template = MakoTemplate(
-                x, strict_undefined=True, input_encoding="utf-8"
-            )
-        except SyntaxException as ex:
-            self.errors = [(ex, ex.lineno)]
-        except CompileException as ex:
-            self.errors = [(ex, ex.lineno)]
+        self.errors = list(_mako_errors(x))
 
 
 class MakoMarkdownText(MakoText):
@@ -99,9 +185,8 @@ class PythonText:
                 (f"code block must be a YAML string, is {type(x).__name__}", 1)
             ]
             return
-        try:
-            ast.parse(x)
-        except SyntaxError as ex:
+        _, ex = _parse_python(x)
+        if ex is not None:
             # ex.lineno gives line number within the code block
             lineno = ex.lineno or 1
             msg = ex.msg or str(ex)
@@ -122,53 +207,45 @@ class ValidationCode(PythonText):
         # If there are already syntax errors, skip the usage check
         if self.errors:
             return
-        try:
-            tree = ast.parse(x)
-        except SyntaxError:
+        tree, _ = _parse_python(x)
+        if tree is None:
             return
-        # Walk AST and search for a call to validation_error(...)
-        calls_validation_error = False
+        # Walk the AST once, looking for a call to validation_error(...) and
+        # noting what else the code does on the way.
+        has_assignment = False
+        has_define_call = False
+        has_expr_call = False
+        has_raise_or_assert = False
         for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                func = node.func
-                if isinstance(func, ast.Name) and func.id == "validation_error":
-                    calls_validation_error = True
-                    break
-        if not calls_validation_error:
-            # Suppress warning for transformation-only code blocks.
-            # This includes assignments (even behind conditionals) and common
-            # mutation helpers like define(...), which are intentionally used to
-            # normalize output in many interviews.
-            has_assignment = any(
-                isinstance(n, (ast.Assign, ast.AugAssign, ast.AnnAssign))
-                for n in ast.walk(tree)
-            )
-            has_define_call = any(
-                isinstance(n, ast.Call)
-                and isinstance(n.func, ast.Name)
-                and n.func.id == "define"
-                for n in ast.walk(tree)
-            )
-            has_expr_call = any(
-                isinstance(n, ast.Expr) and isinstance(n.value, ast.Call)
-                for n in ast.walk(tree)
-            )
-            has_raise_or_assert = any(
-                isinstance(n, (ast.Raise, ast.Assert)) for n in ast.walk(tree)
-            )
-            if (
-                has_assignment or has_define_call or has_expr_call
-            ) and not has_raise_or_assert:
-                return
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                if node.func.id == "validation_error":
+                    return
+                if node.func.id == "define":
+                    has_define_call = True
+            elif isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+                has_assignment = True
+            elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+                has_expr_call = True
+            elif isinstance(node, (ast.Raise, ast.Assert)):
+                has_raise_or_assert = True
+
+        # Suppress warning for transformation-only code blocks.
+        # This includes assignments (even behind conditionals) and common
+        # mutation helpers like define(...), which are intentionally used to
+        # normalize output in many interviews.
+        if (
+            has_assignment or has_define_call or has_expr_call
+        ) and not has_raise_or_assert:
+            return
 
-            # Otherwise, emit a warning suggesting use of validation_error().
-            # Use line number 1 because we don't have a more specific mapping here
-            self.errors.append(
-                (
-                    "validation code does not call validation_error(); consider calling validation_error(...) to provide user-facing error messages",
-                    1,
-                )
+        # Otherwise, emit a warning suggesting use of validation_error().
+        # Use line number 1 because we don't have a more specific mapping here
+        self.errors.append(
+            (
+                "validation code does not call validation_error(); consider calling validation_error(...) to provide user-facing error messages",
+                1,
             )
+        )
 
 
 class PythonBool:
@@ -204,9 +281,11 @@ class JSShowIf:
             return
 
         # Now check JavaScript syntax by removing Mako expressions first
-        js_to_check = x
-        mako_pattern = re.compile(r"\$\{[^}]*\}", re.DOTALL)
-        js_to_check = mako_pattern.sub("true", js_to_check)
+        js_to_check = _MAKO_EXPR_RE.sub("true", x)
+
+        # esprima takes several hundred ms to import (it builds Unicode tables),
+        # and most interviews have no js modifiers at all, so load it on demand.
+        import esprima  # type: ignore[import-untyped]
 
         try:
             parsed = esprima.parseScript(js_to_check, tolerant=False, loc=True).toDict()
@@ -282,31 +361,7 @@ class JSShowIf:
     def _references_screen_variable(self, var_expr):
         if not isinstance(var_expr, str):
             return False
-        for candidate in self._variable_candidates(var_expr):
-            if candidate in self.screen_variables:
-                return True
-        return False
-
-    def _variable_candidates(self, var_expr):
-        expr = var_expr.strip()
-        candidates = {expr}
-        if "." in expr:
-            parts = expr.split(".")
-            for i in range(len(parts), 0, -1):
-                candidates.add(".".join(parts[:i]))
-        expanded = set()
-        for candidate in candidates:
-            candidate = candidate.strip()
-            if not candidate:
-                continue
-            expanded.add(candidate)
-            # Accept both full indexed paths and their base paths, e.g.:
-            # children[i].parents["Other"] -> children[i].parents
-            while candidate.endswith("]") and "[" in candidate:
-                candidate = candidate[: candidate.rfind("[")].strip()
-                if candidate:
-                    expanded.add(candidate)
-        return expanded
+        return not self.screen_variables.isdisjoint(_variable_candidates(var_expr))
 
 
 class ShowIf:
@@ -352,9 +407,8 @@ class ShowIf:
                         )
                     )
                 else:
-                    try:
-                        ast.parse(code_block)
-                    except SyntaxError as ex:
+                    _, ex = _parse_python(code_block)
+                    if ex is not None:
                         lineno = ex.lineno or 1
                         msg = ex.msg or str(ex)
                         self.errors.append(
@@ -462,27 +516,26 @@ class DAFields:
         return None
 
     def _validate_python_modifier(
-        self, modifier_key, modifier_value, field_item, screen_variables
+        self,
+        modifier_key,
+        modifier_value,
+        field_item,
+        screen_variables,
+        screen_tails,
+        x_screen_tails,
     ):
         def references_screen_variable(var_expr):
             if not isinstance(var_expr, str):
                 return False
-            candidates = self._variable_candidates(var_expr)
-            if any(candidate in screen_variables for candidate in candidates):
+            candidates = _variable_candidates(var_expr)
+            if not screen_variables.isdisjoint(candidates):
                 return True
             # In generic-object screens, x.<attr> often aliases another object path
             # like children[i].<attr>. Allow suffix match only when one side is x.<...>.
             for candidate in candidates:
-                if candidate.startswith("x.") and any(
-                    screen_var.endswith("." + candidate.split(".", 1)[1])
-                    for screen_var in screen_variables
-                ):
+                if candidate.startswith("x.") and candidate[2:] in screen_tails:
                     return True
-            for screen_var in screen_variables:
-                if screen_var.startswith("x.") and any(
-                    candidate.endswith("." + screen_var.split(".", 1)[1])
-                    for candidate in candidates
-                ):
+                if not x_screen_tails.isdisjoint(_dotted_tails(candidate)):
                     return True
             return False
 
@@ -546,9 +599,8 @@ class DAFields:
                 )
 
     def _find_screen_variable_references_in_code(self, code_text, screen_variables):
-        try:
-            tree = ast.parse(code_text)
-        except SyntaxError:
+        tree, _ = _parse_python(code_text)
+        if tree is None:
             return set()
 
         name_refs = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
@@ -575,13 +627,24 @@ class DAFields:
             field_var_name = self._extract_field_name(field_item)
             if field_var_name:
                 screen_variables.add(field_var_name)
+        # Built once per screen for the x.<attr> alias checks in
+        # _validate_python_modifier, instead of rescanning every name per lookup.
+        screen_tails = frozenset().union(*map(_dotted_tails, screen_variables))
+        x_screen_tails = frozenset(
+            var[2:] for var in screen_variables if var.startswith("x.")
+        )
 
         for field_item in fields_list:
             if not isinstance(field_item, dict):
                 continue
+            # Most fields carry no show/hide style modifier at all; find that
+            # out with one pass over the field's keys instead of eight lookups.
+            present = _CONDITIONAL_MODIFIERS.intersection(field_item)
+            if not present:
+                continue
 
             for js_key in self.js_modifier_keys:
-                if js_key in field_item:
+                if js_key in present:
                     validator = JSShowIf(
                         field_item[js_key],
                         modifier_key=js_key,
@@ -603,32 +666,16 @@ class DAFields:
                         )
 
             for py_key in self.py_modifier_keys:
-                if py_key in field_item:
+                if py_key in present:
                     self._validate_python_modifier(
-                        py_key, field_item[py_key], field_item, screen_variables
+                        py_key,
+                        field_item[py_key],
+                        field_item,
+                        screen_variables,
+                        screen_tails,
+                        x_screen_tails,
                     )
 
-    def _variable_candidates(self, var_expr):
-        expr = var_expr.strip()
-        candidates = {expr}
-        if "." in expr:
-            parts = expr.split(".")
-            for i in range(len(parts), 0, -1):
-                candidates.add(".".join(parts[:i]))
-        expanded = set()
-        for candidate in candidates:
-            candidate = candidate.strip()
-            if not candidate:
-                continue
-            expanded.add(candidate)
-            # Accept both full indexed paths and their base paths, e.g.:
-            # children[i].parents["Other"] -> children[i].parents
-            while candidate.endswith("]") and "[" in candidate:
-                candidate = candidate[: candidate.rfind("[")].strip()
-                if candidate:
-                    expanded.add(candidate)
-        return expanded
-
 
 # type notes what the value for that dictionary key is,
 
@@ -842,6 +889,12 @@ types_of_blocks: dict[str, dict[str, Any]] = {
     "machine learning storage": {},
 }
 
+# Block types that can't share a block with another type (unless partners);
+# fixed at import since types_of_blocks never changes.
+_EXCLUSIVE_BLOCK_TYPES = tuple(
+    key for key, info in types_of_blocks.items() if info.get("exclusive", True)
+)
+
 #######
 # These things are from DA's source code. Since this should be lightweight,
 # I don't want to directly include things from DA. We'll see if that works.
@@ -1033,22 +1086,15 @@ all_dict_keys = (
     "sort key",
     "sort reverse",
 )
+_ALL_DICT_KEYS = frozenset(all_dict_keys)
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class YAMLError:
-    def __init__(
-        self,
-        *,
-        err_str: str,
-        line_number: int,
-        file_name: str,
-        experimental: bool = True,
-    ):
-        self.err_str = err_str
-        self.line_number = line_number
-        self.file_name = file_name
-        self.experimental = experimental
-        pass
+    err_str: str
+    line_number: int
+    file_name: str
+    experimental: bool = True
 
     def __str__(self):
         if not self.experimental:
@@ -1056,8 +1102,9 @@ class YAMLError:
         return f"At {self.file_name}:{self.line_number}: {self.err_str}"
 
 
+@lru_cache(maxsize=1024)
 def _normalize_expr(expr: str) -> str:
-    normalized = re.sub(r"\s+", "", expr or "")
+    normalized = _WHITESPACE_RE.sub("", expr or "")
     return normalized.replace('"', "'")
 
 
@@ -1094,16 +1141,13 @@ def _extract_field_var_name(field_item: Any) -> Optional[str]:
     return None
 
 
-def _extract_names_from_python_expr(expr: str) -> set[str]:
-    names: set[str] = set()
-    try:
-        tree = ast.parse(expr)
-    except SyntaxError:
-        return names
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Name):
-            names.add(node.id)
-    return names
+@lru_cache(maxsize=1024)
+def _extract_names_from_python_expr(expr: str) -> frozenset[str]:
+    # Memoized: the same condition text is often repeated across fields.
+    tree, _ = _parse_python(expr)
+    if tree is None:
+        return frozenset()
+    return frozenset(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
 
 
 def _extract_controller_vars_for_field_modifier(modifier_value: Any) -> set[str]:
@@ -1128,7 +1172,7 @@ def _extract_vars_from_js_condition(cond: str) -> set[str]:
 
 
 def _invert_simple_comparison(cond: str) -> Optional[str]:
-    m = re.match(r"^\s*(.+?)\s*(==|!=)\s*(.+?)\s*$", cond or "")
+    m = _SIMPLE_COMPARISON_RE.match(cond or "")
     if not m:
         return None
     left, op, right = m.groups()
@@ -1210,8 +1254,10 @@ def _extract_conditional_fields_from_doc(
         if not field_var or not isinstance(field_item, dict):
             continue
 
-        for modifier_key in _CONDITIONAL_MODIFIERS:
-            if modifier_key not in field_item:
+        # Walk the field's own (few) keys in document order rather than
+        # probing it for all eight modifiers.
+        for modifier_key in field_item:
+            if modifier_key not in _CONDITIONAL_MODIFIERS:
                 continue
             modifier_value = field_item[modifier_key]
             guards = _guard_candidates_for_modifier(modifier_key, modifier_value)
@@ -1227,13 +1273,17 @@ def _extract_conditional_fields_from_doc(
     return conditional_fields
 
 
+@lru_cache(maxsize=512)
+def _variable_reference_pattern(variable_expr: str) -> re.Pattern[str]:
+    if _SIMPLE_IDENTIFIER_RE.match(variable_expr):
+        return re.compile(rf"\b{re.escape(variable_expr)}\b")
+    # Avoid prefix false positives like matching "foo.bar" inside "foo.bar2".
+    return re.compile(rf"{re.escape(variable_expr)}(?!\w)")
+
+
 def _find_variable_reference_lines(code: str, variable_expr: str) -> list[int]:
     lines = code.splitlines()
-    if _SIMPLE_IDENTIFIER_RE.match(variable_expr):
-        pattern = re.compile(rf"\b{re.escape(variable_expr)}\b")
-    else:
-        # Avoid prefix false positives like matching "foo.bar" inside "foo.bar2".
-        pattern = re.compile(rf"{re.escape(variable_expr)}(?!\w)")
+    pattern = _variable_reference_pattern(variable_expr)
     return [i + 1 for i, line in enumerate(lines) if pattern.search(line)]
 
 
@@ -1253,9 +1303,8 @@ def _statement_span(stmts: list[ast.stmt]) -> Optional[tuple[int, int]]:
 
 def _extract_branch_guards_by_line(code: str) -> dict[int, list[str]]:
     guards_by_line: dict[int, list[str]] = {}
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+    tree, _ = _parse_python(code)
+    if tree is None:
         return guards_by_line
 
     for node in ast.walk(tree):
@@ -1289,9 +1338,16 @@ def _extract_branch_guards_by_line(code: str) -> dict[int, list[str]]:
     return guards_by_line
 
 
-def _has_showifdef_guard(active_guards: list[str], field_var: str) -> bool:
+@lru_cache(maxsize=512)
+def _showifdef_pattern(field_var: str) -> re.Pattern[str]:
     quoted_var = re.escape(field_var)
-    showifdef_pattern = re.compile(rf"showifdef\s*\(\s*['\"]{quoted_var}['\"]\s*\)")
+    return re.compile(rf"showifdef\s*\(\s*['\"]{quoted_var}['\"]\s*\)")
+
+
+def _has_showifdef_guard(active_guards: list[str], field_var: str) -> bool:
+    if not active_guards:
+        return False
+    showifdef_pattern = _showifdef_pattern(field_var)
     return any(showifdef_pattern.search(guard or "") for guard in active_guards)
 
 
@@ -1315,9 +1371,15 @@ def _find_unmatched_interview_order_references(
     if not _is_interview_order_style_block(doc):
         return []
 
+    # A reference needs the variable name somewhere in the code, so a plain
+    # substring test rules out most fields before parsing the code at all.
+    referenced = [c for c in conditional_fields if c["field_var"] in code]
+    if not referenced:
+        return []
+
     guards_by_line = _extract_branch_guards_by_line(code)
     unmatched: list[tuple[str, int]] = []
-    for conditional in conditional_fields:
+    for conditional in referenced:
         field_var = conditional["field_var"]
         expected_guards = conditional["guards"]
         for ref_line in _find_variable_reference_lines(code, field_var):
@@ -1357,28 +1419,41 @@ def _max_screen_visibility_nesting_depth(doc: dict[str, Any]) -> int:
             )
             for controller in controllers:
                 if controller in screen_vars:
-                    adjacency.setdefault(controller, set()).add(target_var)
-
-    visiting: set[str] = set()
-    memo: dict[str, int] = {}
-
-    def depth(var_name: str) -> int:
-        if var_name in memo:
-            return memo[var_name]
-        if var_name in visiting:
-            return 0
-        visiting.add(var_name)
-        max_child = 0
-        for child in adjacency.get(var_name, set()):
-            max_child = max(max_child, 1 + depth(child))
-        visiting.remove(var_name)
-        memo[var_name] = max_child
-        return max_child
-
-    return max((depth(var) for var in adjacency.keys()), default=0)
+                    adjacency[controller].add(target_var)
+
+    # Longest controller -> dependent chain below each field, memoized. An
+    # edge back onto the current path (a show if/hide if cycle) is cut and
+    # counts as one level. Iterative so deep screens can't hit the recursion
+    # limit.
+    height: dict[str, int] = {}
+    on_path: set[str] = set()
+    for root in adjacency:
+        if root in height:
+            continue
+        on_path.add(root)
+        # Frames are [field, iterator over its dependents, deepest so far]
+        stack: list[list[Any]] = [[root, iter(adjacency[root]), 0]]
+        while stack:
+            frame = stack[-1]
+            child = next(frame[1], None)
+            if child is not None:
+                if child in height:
+                    frame[2] = max(frame[2], height[child] + 1)
+                elif child in on_path:
+                    frame[2] = max(frame[2], 1)
+                else:
+                    on_path.add(child)
+                    stack.append([child, iter(adjacency[child]), 0])
+                continue
+            stack.pop()
+            on_path.discard(frame[0])
+            height[frame[0]] = frame[2]
+            if stack:
+                stack[-1][2] = max(stack[-1][2], frame[2] + 1)
+    return max(height.values(), default=0)
 
 
-class SafeLineLoader(SafeLoader):
+class _LineConstructor(SafeConstructor):
     """https://stackoverflow.com/questions/13319067/parsing-yaml-return-with-line-number"""
 
     def construct_mapping(self, node, deep=False):
@@ -1402,31 +1477,189 @@ class SafeLineLoader(SafeLoader):
                     )
                 seen_keys.add(key)
 
-        mapping = super(SafeLineLoader, self).construct_mapping(node, deep=deep)
+        mapping = super().construct_mapping(node, deep=deep)
         mapping["__line__"] = node.start_mark.line + 1
         return mapping
 
 
+class SafeLineLoader(_LineConstructor, _BaseLoader):
+    pass
+
+
+class _PySafeLineLoader(_LineConstructor, SafeLoader):
+    """Pure-Python twin of SafeLineLoader, used to describe parse errors"""
+
+
+def _load_yaml(source_code: str) -> Any:
+    try:
+        return yaml.load(source_code, SafeLineLoader)
+    except yaml.YAMLError:
+        if _BaseLoader is SafeLoader:
+            raise
+        # libyaml's messages lack the source snippet the Python parser
+        # prints; broken documents are rare, so parse them again for that.
+        return yaml.load(source_code, _PySafeLineLoader)
+
+
+def _find_errors_in_doc(
+    doc: dict[str, Any],
+    line_number: int,
+    input_file: str,
+    prior_conditional_fields: list[dict[str, Any]],
+) -> list[YAMLError]:
+    """Return the YAMLErrors for a single already-loaded YAML document
+
+    Args:
+        doc (dict): The document mapping, as produced by SafeLineLoader.
+        line_number (int): Line in the file where the document starts.
+        input_file (str): File name to attach to the errors.
+        prior_conditional_fields (list): Conditional fields seen in earlier
+            documents; extended in place with the ones from this document.
+    Returns:
+        list[YAMLError]: List of YAMLError instances found in the document.
+    """
+    all_errors = []
+    # Mappings built by hand rather than by SafeLineLoader have no line info
+    doc_line = doc.get("__line__", 1)
+
+    any_types = [block for block in types_of_blocks.keys() if block in doc]
+    if len(any_types) == 0:
+        all_errors.append(
+            YAMLError(
+                err_str=f"No possible types found: {doc}",
+                line_number=line_number,
+                file_name=input_file,
+            )
+        )
+    posb_types = [block for block in _EXCLUSIVE_BLOCK_TYPES if block in doc]
+    if len(posb_types) > 1:
+        if len(posb_types) == 2 and posb_types[1] in (
+            types_of_blocks[posb_types[0]].get("partners") or []
+        ):
+            pass
+        else:
+            all_errors.append(
+                YAMLError(
+                    err_str=f"Too many types this block could be: {posb_types}",
+                    line_number=line_number,
+                    file_name=input_file,
+                )
+            )
+    weird_keys = []
+    for attr in doc.keys():
+        if attr == "__line__":
+            continue
+        if not isinstance(attr, str):
+            # Non-string keys (e.g., bools) are not expected in DA interview files
+            weird_keys.append(str(attr))
+        elif attr.lower() not in _ALL_DICT_KEYS:
+            weird_keys.append(attr)
+    if len(weird_keys) > 0:
+        all_errors.append(
+            YAMLError(
+                err_str=f"Keys that shouldn't exist! {weird_keys}",
+                line_number=line_number,
+                file_name=input_file,
+                experimental=False,
+            )
+        )
+    for key in doc.keys():
+        if key in big_dict and "type" in big_dict[key]:
+            test = big_dict[key]["type"](doc[key])
+            for err in test.errors:
+                all_errors.append(
+                    YAMLError(
+                        err_str=f"{err[0]}",
+                        line_number=err[1] + doc_line + line_number,
+                        file_name=input_file,
+                    )
+                )
+
+    unmatched_refs = _find_unmatched_interview_order_references(
+        doc, prior_conditional_fields
+    )
+    for field_var, ref_line in unmatched_refs:
+        all_errors.append(
+            YAMLError(
+                err_str=(
+                    f'interview-order style block references "{field_var}" without a matching guard '
+                    f"for that field's show/hide logic; this can cause the interview to get stuck"
+                ),
+                line_number=doc_line + line_number + ref_line,
+                file_name=input_file,
+            )
+        )
+
+    nesting_depth = _max_screen_visibility_nesting_depth(doc)
+    if nesting_depth > 2:
+        all_errors.append(
+            YAMLError(
+                err_str=(
+                    f"Warning: show if/hide if visibility logic is nested {nesting_depth} levels "
+                    "on this screen (more than 2)"
+                ),
+                line_number=doc_line + line_number,
+                file_name=input_file,
+            )
+        )
+
+    prior_conditional_fields.extend(
+        _extract_conditional_fields_from_doc(doc, line_number)
+    )
+    return all_errors
+
+
+def find_errors_from_obj(obj: Any, input_file: Optional[str] = None) -> list[YAMLError]:
+    """Return list of YAMLError found in already-loaded YAML documents
+
+    Skips the YAML parser entirely, so parse-time checks such as duplicate
+    keys are not applied and line numbers are only as good as any
+    ``__line__`` entries in the mappings.
+
+    Args:
+        obj: A single document mapping, or a list of them in file order.
+        input_file (str): File name to attach to the errors.
+    Returns:
+        list[YAMLError]: List of YAMLError instances found in the documents.
+    """
+    if not input_file:
+        input_file = "<object input>"
+
+    docs = obj if isinstance(obj, list) else [obj]
+    all_errors: list[YAMLError] = []
+    prior_conditional_fields: list[dict[str, Any]] = []
+    for doc in docs:
+        if doc is None:
+            continue
+        all_errors.extend(
+            _find_errors_in_doc(doc, 1, input_file, prior_conditional_fields)
+        )
+    return all_errors
+
+
 def find_errors_from_string(
     full_content: str, input_file: Optional[str] = None
 ) -> list[YAMLError]:
     """Return list of YAMLError found in the given full_content string
 
+    Results are memoized on (full_content, input_file). YAMLError is
+    immutable, so each call gets a new list of the same shared errors.
+
     Args:
         full_content (str): Full YAML content as a string.
     Returns:
         list[YAMLError]: List of YAMLError instances found in the content.
     """
-    all_errors = []
-
     if not input_file:
         input_file = "<string input>"
 
-    exclusive_keys = [
-        key
-        for key in types_of_blocks.keys()
-        if types_of_blocks[key].get("exclusive", True)
-    ]
+    return list(_find_errors_cached(full_content, input_file))
+
+
+@lru_cache(maxsize=256)
+def _find_errors_cached(full_content: str, input_file: str) -> tuple[YAMLError, ...]:
+    all_errors = []
+
     prior_conditional_fields: list[dict[str, Any]] = []
 
     line_number = 1
@@ -1435,7 +1668,7 @@ def find_errors_from_string(
         source_code = remove_trailing_dots.sub("", source_code)
         source_code = fix_tabs.sub("  ", source_code)
         try:
-            doc = yaml.load(source_code, SafeLineLoader)
+            doc = _load_yaml(source_code)
         except Exception as errMess:
             if isinstance(errMess, yaml.error.MarkedYAMLError):
                 if errMess.context_mark is not None:
@@ -1457,93 +1690,12 @@ def find_errors_from_string(
             # Just YAML comments, that's fine
             line_number += lines_in_code
             continue
-        any_types = [block for block in types_of_blocks.keys() if block in doc]
-        if len(any_types) == 0:
-            all_errors.append(
-                YAMLError(
-                    err_str=f"No possible types found: {doc}",
-                    line_number=line_number,
-                    file_name=input_file,
-                )
-            )
-        posb_types = [block for block in exclusive_keys if block in doc]
-        if len(posb_types) > 1:
-            if len(posb_types) == 2 and posb_types[1] in (
-                types_of_blocks[posb_types[0]].get("partners") or []
-            ):
-                pass
-            else:
-                all_errors.append(
-                    YAMLError(
-                        err_str=f"Too many types this block could be: {posb_types}",
-                        line_number=line_number,
-                        file_name=input_file,
-                    )
-                )
-        weird_keys = []
-        for attr in doc.keys():
-            if attr == "__line__":
-                continue
-            if not isinstance(attr, str):
-                # Non-string keys (e.g., bools) are not expected in DA interview files
-                weird_keys.append(str(attr))
-            elif attr.lower() not in all_dict_keys:
-                weird_keys.append(attr)
-        if len(weird_keys) > 0:
-            all_errors.append(
-                YAMLError(
-                    err_str=f"Keys that shouldn't exist! {weird_keys}",
-                    line_number=line_number,
-                    file_name=input_file,
-                    experimental=False,
-                )
-            )
-        for key in doc.keys():
-            if key in big_dict and "type" in big_dict[key]:
-                test = big_dict[key]["type"](doc[key])
-                for err in test.errors:
-                    all_errors.append(
-                        YAMLError(
-                            err_str=f"{err[0]}",
-                            line_number=err[1] + doc["__line__"] + line_number,
-                            file_name=input_file,
-                        )
-                    )
-
-        unmatched_refs = _find_unmatched_interview_order_references(
-            doc, prior_conditional_fields
-        )
-        for field_var, ref_line in unmatched_refs:
-            all_errors.append(
-                YAMLError(
-                    err_str=(
-                        f'interview-order style block references "{field_var}" without a matching guard '
-                        f"for that field's show/hide logic; this can cause the interview to get stuck"
-                    ),
-                    line_number=doc["__line__"] + line_number + ref_line,
-                    file_name=input_file,
-                )
-            )
-
-        nesting_depth = _max_screen_visibility_nesting_depth(doc)
-        if nesting_depth > 2:
-            all_errors.append(
-                YAMLError(
-                    err_str=(
-                        f"Warning: show if/hide if visibility logic is nested {nesting_depth} levels "
-                        "on this screen (more than 2)"
-                    ),
-                    line_number=doc["__line__"] + line_number,
-                    file_name=input_file,
-                )
-            )
-
-        prior_conditional_fields.extend(
-            _extract_conditional_fields_from_doc(doc, line_number)
+        all_errors.extend(
+            _find_errors_in_doc(doc, line_number, input_file, prior_conditional_fields)
         )
 
         line_number += lines_in_code
-    return all_errors
+    return tuple(all_errors)
 
 
 def find_errors(input_file: str) -> list[YAMLError]:
@@ -1607,7 +1759,25 @@ def process_file(input_file) -> int:
     return len(all_errors)
 
 
-def main() -> int:
+def _process_file_captured(input_file: str) -> tuple[int, str]:
+    """Run process_file in a worker, returning its error count and output.
+
+    The output is handed back so that main can print it in file order.
+    """
+    with redirect_stdout(io.StringIO()) as out:
+        error_count = process_file(input_file)
+    return error_count, out.getvalue()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """CLI entry point.
+
+    Args:
+        argv (list[str], optional): Command-line arguments; defaults to sys.argv[1:].
+
+    Returns:
+        int: process exit code
+    """
     parser = argparse.ArgumentParser(
         description="Validate Docassemble YAML files",
     )
@@ -1625,7 +1795,16 @@ def main() -> int:
             "(.git*, .github*, sources)"
         ),
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to check in parallel (0 = one per CPU; default: 1)",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or a positive number")
 
     yaml_files = _collect_yaml_files(
         args.files, include_default_ignores=not args.check_all
@@ -1634,11 +1813,23 @@ def main() -> int:
         print("No YAML files found.", file=sys.stderr)
         return 1
 
+    jobs = args.jobs or os.cpu_count() or 1
     failed = False
-    for input_file in yaml_files:
-        error_count = process_file(str(input_file))
-        if error_count > 0:
-            failed = True
+    if jobs == 1 or len(yaml_files) == 1:
+        for input_file in yaml_files:
+            error_count = process_file(str(input_file))
+            if error_count > 0:
+                failed = True
+        return 1 if failed else 0
+
+    # Each file is checked independently; output is replayed in input order.
+    with ProcessPoolExecutor(max_workers=min(jobs, len(yaml_files))) as pool:
+        for error_count, output in pool.map(
+            _process_file_captured, [str(f) for f in yaml_files]
+        ):
+            print(output, end="")
+            if error_count > 0:
+                failed = True
     return 1 if failed else 0
 
 
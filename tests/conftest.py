@@ -0,0 +1,31 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def default_ignores_tree(tmp_path_factory):
+    """Directory tree with one visible YAML file and three default-ignored ones.
+
+    Built once per session; tests must treat it as read-only.
+    """
+    root = tmp_path_factory.mktemp("default_ignores_tree")
+    tree = SimpleNamespace(
+        root=root,
+        visible=root / "visible.yml",
+        git_file=root / ".git" / "hidden.yml",
+        github_file=root / ".github-actions" / "ci.yml",
+        sources_file=root / "sources" / "skip.yml",
+    )
+
+    # root already exists, so each leaf directory is a single mkdir
+    for sub in (".git", ".github-actions", "sources"):
+        os.mkdir(root / sub)
+
+    tree.visible.write_bytes(b"question: visible\n")
+    tree.git_file.write_bytes(b"question: git\n")
+    tree.github_file.write_bytes(b"question: github\n")
+    tree.sources_file.write_bytes(b"question: sources\n")
+
+    return tree
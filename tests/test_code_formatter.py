@@ -1,9 +1,21 @@
+import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
 from dayamlchecker.code_formatter import (
     format_python_code,
+    format_yaml_file,
     format_yaml_string,
     FormatterConfig,
+    _black_format_cached,
+    _cache_entry,
+    _cache_key,
     _convert_indent_4_to_2,
+    _prune_cache,
+    _prune_cache_if_due,
     _strip_common_indent,
 )
 
@@ -43,6 +55,13 @@ class TestStripCommonIndent(unittest.TestCase):
         lines = ["    line1\n", "\n", "    line2\n"]
         dedented, removed = _strip_common_indent(lines)
         self.assertEqual(removed, 4)
+        self.assertEqual(dedented, ["line1\n", "\n", "line2\n"])
+
+    def test_strip_common_indent_no_indent(self):
+        lines = ["line1\n", "  line2\n"]
+        dedented, removed = _strip_common_indent(lines)
+        self.assertEqual(removed, 0)
+        self.assertEqual(dedented, lines)
 
 
 class TestFormatPythonCode(unittest.TestCase):
@@ -73,6 +92,25 @@ class TestFormatPythonCode(unittest.TestCase):
         # Nested should be 4 spaces (2 * 2) instead of 8 (4 * 2)
         self.assertIn("\n    x = 1", result)
 
+    def test_strips_trailing_whitespace_in_strings(self):
+        code = 's = """a   \nb\t\n"""'
+        result = format_python_code(code)
+        self.assertEqual(result, 's = """a\nb\n"""\n')
+
+    def test_keeps_trailing_whitespace_when_disabled(self):
+        code = 's = """a   \nb\n"""'
+        config = FormatterConfig(strip_trailing_whitespace=False)
+        result = format_python_code(code, config)
+        self.assertIn("a   \n", result)
+
+    def test_repeated_code_reuses_black_result(self):
+        code = "total=a+b"
+        first = format_python_code(code)
+        hits_before = _black_format_cached.cache_info().hits
+        second = format_python_code(code)
+        self.assertEqual(first, second)
+        self.assertEqual(_black_format_cached.cache_info().hits, hits_before + 1)
+
 
 class TestFormatYamlString(unittest.TestCase):
     def test_format_code_block(self):
@@ -136,6 +174,13 @@ code: |
         self.assertIn("x = 1", result)
         self.assertIn("y = 2", result)
 
+    def test_concurrent_calls_match_serial_results(self):
+        docs = [f"---\nquestion: Q{i}\ncode: |\n  x{i}=[{i},{i}]\n" for i in range(40)]
+        expected = [format_yaml_string(doc) for doc in docs]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(format_yaml_string, docs))
+        self.assertEqual(results, expected)
+
     def test_nested_code_in_fields(self):
         yaml_content = """---
 question: Test
@@ -230,6 +275,96 @@ code: |
         self.assertIn("if True:\n    x = 1", result)
 
 
+class TestFormatYamlFile(unittest.TestCase):
+    def test_writes_formatted_content(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "interview.yml"
+            path.write_bytes(b"---\ncode: |\n  x=1\n")
+            result, changed = format_yaml_file(path)
+            self.assertTrue(changed)
+            self.assertEqual(path.read_bytes(), b"---\ncode: |\n  x = 1\n")
+            self.assertEqual(result, "---\ncode: |\n  x = 1\n")
+
+    def test_crlf_input_is_normalized(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "interview.yml"
+            path.write_bytes(b"---\r\ncode: |\r\n  x=1\r\n")
+            _, changed = format_yaml_file(path)
+            self.assertTrue(changed)
+            self.assertEqual(path.read_bytes(), b"---\ncode: |\n  x = 1\n")
+
+    def test_cache_hit_skips_formatting(self):
+        with TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp) / "cache"
+            path = Path(tmp) / "interview.yml"
+            path.write_bytes(b"---\ncode: |\n  x=1\n")
+            first = format_yaml_file(path, write=False, cache_dir=cache_dir)
+            with patch(
+                "dayamlchecker.code_formatter.format_yaml_string"
+            ) as format_string:
+                second = format_yaml_file(path, write=False, cache_dir=cache_dir)
+            format_string.assert_not_called()
+            self.assertEqual(first, second)
+
+    def test_prune_only_removes_old_cache_entries(self):
+        with TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            old_key = _cache_key("old: 1\n", FormatterConfig())
+            new_key = _cache_key("new: 1\n", FormatterConfig())
+            old_entry = _cache_entry(cache_dir, old_key)
+            new_entry = _cache_entry(cache_dir, new_key)
+            # Unrelated files that merely sit next to the cache, e.g. when
+            # --cache-dir points at a home or project directory
+            thesis = cache_dir / "Documents" / "thesis.txt"
+            stray_in_shard = old_entry.parent / "notes.txt"
+            for path in (old_entry, new_entry, thesis, stray_in_shard):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"0\n")
+            long_ago = 946684800  # 2000-01-01
+            for path in (old_entry, thesis, stray_in_shard):
+                os.utime(path, (long_ago, long_ago))
+
+            _prune_cache(cache_dir)
+
+            self.assertFalse(old_entry.exists())
+            self.assertTrue(new_entry.exists())
+            self.assertTrue(thesis.exists())
+            self.assertTrue(stray_in_shard.exists())
+
+    def test_prune_runs_at_most_once_per_interval(self):
+        with TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            long_ago = 946684800  # 2000-01-01
+            first = _cache_entry(cache_dir, _cache_key("a: 1\n", FormatterConfig()))
+            first.parent.mkdir(parents=True)
+            first.write_bytes(b"0\n")
+            os.utime(first, (long_ago, long_ago))
+
+            _prune_cache_if_due(cache_dir)
+            self.assertFalse(first.exists())
+
+            # A stale entry written right after a prune survives until the
+            # interval has passed
+            second = _cache_entry(cache_dir, _cache_key("b: 1\n", FormatterConfig()))
+            second.parent.mkdir(parents=True, exist_ok=True)
+            second.write_bytes(b"0\n")
+            os.utime(second, (long_ago, long_ago))
+
+            _prune_cache_if_due(cache_dir)
+            self.assertTrue(second.exists())
+
+            _prune_cache_if_due(cache_dir, interval=0)
+            self.assertFalse(second.exists())
+
+    def test_check_mode_does_not_write(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "interview.yml"
+            path.write_bytes(b"---\ncode: |\n  x=1\n")
+            _, changed = format_yaml_file(path, write=False)
+            self.assertTrue(changed)
+            self.assertEqual(path.read_bytes(), b"---\ncode: |\n  x=1\n")
+
+
 class TestFormatterConfig(unittest.TestCase):
     def test_default_config(self):
         config = FormatterConfig()
@@ -244,6 +379,20 @@ class TestFormatterConfig(unittest.TestCase):
         self.assertIn("custom_code", config.python_keys)
         self.assertNotIn("validation code", config.python_keys)
 
+    def test_config_is_frozen_and_hashable(self):
+        config = FormatterConfig(python_keys={"code"})
+        self.assertIsInstance(config.python_keys, frozenset)
+        self.assertEqual(hash(config), hash(FormatterConfig(python_keys={"code"})))
+        with self.assertRaises(AttributeError):
+            config.black_line_length = 79  # type: ignore[misc]
+
+    def test_fingerprint_tracks_settings(self):
+        self.assertEqual(FormatterConfig().fingerprint, FormatterConfig().fingerprint)
+        self.assertNotEqual(
+            FormatterConfig().fingerprint,
+            FormatterConfig(black_line_length=79).fingerprint,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
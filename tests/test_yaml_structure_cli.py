@@ -1,67 +1,62 @@
-from pathlib import Path
-from tempfile import TemporaryDirectory
+from dayamlchecker.yaml_structure import _collect_yaml_files, main
 
-from dayamlchecker.yaml_structure import _collect_yaml_files
 
+def test_collect_yaml_files_recurses_directories_and_dedupes(tmp_path):
+    root = tmp_path
+    nested = root / "nested"
+    nested.mkdir()
 
-def test_collect_yaml_files_recurses_directories_and_dedupes():
-    with TemporaryDirectory() as tmp:
-        root = Path(tmp)
-        nested = root / "nested"
-        nested.mkdir()
+    first = root / "a.yml"
+    second = nested / "b.yaml"
+    other = nested / "ignore.txt"
 
-        first = root / "a.yml"
-        second = nested / "b.yaml"
-        other = nested / "ignore.txt"
+    first.write_text("question: one\n", encoding="utf-8")
+    second.write_text("question: two\n", encoding="utf-8")
+    other.write_text("not yaml\n", encoding="utf-8")
 
-        first.write_text("question: one\n", encoding="utf-8")
-        second.write_text("question: two\n", encoding="utf-8")
-        other.write_text("not yaml\n", encoding="utf-8")
+    collected = _collect_yaml_files([root, second])
 
-        collected = _collect_yaml_files([root, second])
+    assert collected == [first, second]
 
-        assert collected == [first, second]
 
+def test_collect_yaml_files_default_ignores_common_directories(default_ignores_tree):
+    tree = default_ignores_tree
 
-def test_collect_yaml_files_default_ignores_common_directories():
-    with TemporaryDirectory() as tmp:
-        root = Path(tmp)
-        visible = root / "visible.yml"
-        git_file = root / ".git" / "hidden.yml"
-        github_file = root / ".github-actions" / "ci.yml"
-        sources_file = root / "sources" / "skip.yml"
+    collected = _collect_yaml_files([tree.root])
 
-        git_file.parent.mkdir(parents=True)
-        github_file.parent.mkdir(parents=True)
-        sources_file.parent.mkdir(parents=True)
+    assert collected == [tree.visible]
 
-        visible.write_text("question: visible\n", encoding="utf-8")
-        git_file.write_text("question: git\n", encoding="utf-8")
-        github_file.write_text("question: github\n", encoding="utf-8")
-        sources_file.write_text("question: sources\n", encoding="utf-8")
 
-        collected = _collect_yaml_files([root])
+def test_collect_yaml_files_can_disable_default_ignores(default_ignores_tree):
+    tree = default_ignores_tree
 
-        assert collected == [visible]
+    collected = _collect_yaml_files([tree.root], include_default_ignores=False)
 
+    assert collected == sorted(
+        [tree.visible, tree.git_file, tree.github_file, tree.sources_file]
+    )
 
-def test_collect_yaml_files_can_disable_default_ignores():
-    with TemporaryDirectory() as tmp:
-        root = Path(tmp)
-        visible = root / "visible.yml"
-        git_file = root / ".git" / "hidden.yml"
-        github_file = root / ".github-actions" / "ci.yml"
-        sources_file = root / "sources" / "skip.yml"
 
-        git_file.parent.mkdir(parents=True)
-        github_file.parent.mkdir(parents=True)
-        sources_file.parent.mkdir(parents=True)
+def test_main_accepts_argv_and_reports_missing_yaml(tmp_path):
+    assert main([str(tmp_path)]) == 1
 
-        visible.write_text("question: visible\n", encoding="utf-8")
-        git_file.write_text("question: git\n", encoding="utf-8")
-        github_file.write_text("question: github\n", encoding="utf-8")
-        sources_file.write_text("question: sources\n", encoding="utf-8")
 
-        collected = _collect_yaml_files([root], include_default_ignores=False)
+def test_main_accepts_argv_for_valid_file(tmp_path):
+    target = tmp_path / "interview.yml"
+    target.write_text("question: |\n  Hi\nfield: name\n", encoding="utf-8")
 
-        assert collected == sorted([visible, git_file, github_file, sources_file])
+    assert main([str(target)]) == 0
+
+
+def test_main_jobs_reports_errors_in_file_order(tmp_path, capsys):
+    (tmp_path / "a.yml").write_text(
+        "question: |\n  Hi\nfield: name\n", encoding="utf-8"
+    )
+    (tmp_path / "b.yml").write_text("question: Hi\nbogus key: 1\n", encoding="utf-8")
+    (tmp_path / "c.yml").write_text("question: Hi\nnope: 2\n", encoding="utf-8")
+
+    assert main(["--jobs", "2", str(tmp_path)]) == 1
+
+    out = capsys.readouterr().out
+    assert out.startswith(".")
+    assert out.index("bogus key") < out.index("nope")